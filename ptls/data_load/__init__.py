@@ -6,6 +6,7 @@ import warnings
 from functools import partial
 from collections import defaultdict
 from multiprocessing.pool import Pool
+from typing import Dict
 
 import numpy as np
 import pyarrow.parquet as pq
@@ -14,6 +15,8 @@ from torch.utils.data import WeightedRandomSampler, Sampler, Dataset
 from torch.utils.data.dataloader import DataLoader
 
 from ptls.data_load.augmentations.all_time_shuffle import AllTimeShuffle
+from ptls.data_load.augmentations.dropout_trx import DropoutTrx, batch_dropout_trx
+from ptls.data_load.gpu_prefetcher import GPUPrefetcher
 from ptls.data_load.iterable_processing_dataset import IterableProcessingDataset
 from ptls.data_load.padded_batch import PaddedBatch
 
@@ -155,6 +158,7 @@ class DropoutTrxDataset(Dataset):
     def __init__(self, dataset: Dataset, trx_dropout, seq_len, with_target=True):
         self.core_dataset = dataset
         self.trx_dropout = trx_dropout
+        self.dropout_trx = DropoutTrx(trx_dropout)
         self.max_seq_len = seq_len
         self.style = dataset.style
         self.with_target = with_target
@@ -181,12 +185,7 @@ class DropoutTrxDataset(Dataset):
 
         seq_len = len(next(iter(x.values())))
 
-        if self.trx_dropout > 0 and seq_len > 0:
-            idx = np.random.choice(seq_len, size=int(seq_len * (1 - self.trx_dropout)+1), replace=False)
-            idx = np.sort(idx)
-        else:
-            idx = np.arange(seq_len)
-
+        idx = self.dropout_trx.get_idx(seq_len)
         idx = idx[-self.max_seq_len:]
         new_x = {k: v[idx] for k, v in x.items()}
 
@@ -253,6 +252,68 @@ class TrxDataset(Dataset):
             return x
 
 
+class SoATrxDataset(Dataset):
+    """`TrxDataset` with all sequences stored in one contiguous tensor per feature.
+
+    Sample `i` is `feature_tensors[k][offsets[i]:offsets[i + 1]]` for each feature `k`.
+    `__getitem__` returns views, no data is copied.
+    Use `SoATrxDataset.from_records` to convert `TrxDataset`-style records.
+
+    Parameters
+        feature_tensors:
+            dict with concatenated sequences for each feature
+        offsets:
+            int tensor with `len(dataset) + 1` sequence bounds, starts with 0
+        targets:
+            target for each sample. Required when `with_target=True`
+    """
+    def __init__(self, feature_tensors: Dict[str, torch.Tensor], offsets: torch.Tensor,
+                 targets=None, y_dtype=np.float32, with_target=True):
+        self.feature_tensors = feature_tensors
+        self.offsets = offsets
+        self._bounds = offsets.tolist()
+        self.targets = None if targets is None else np.asarray(targets)
+        self.y_dtype = y_dtype
+        self.with_target = with_target
+        self.style = 'map'
+
+        if with_target and self.targets is None:
+            raise AttributeError('`targets` are required when `with_target=True`')
+
+    @classmethod
+    def from_records(cls, data, **kwargs):
+        """Build from records with `feature_arrays` dict and `target` like `TrxDataset` expects.
+        Feature arrays can be tensors or numpy arrays
+        """
+        data = list(data)
+        lengths = [len(next(iter(rec['feature_arrays'].values()))) for rec in data]
+        offsets = torch.zeros(len(data) + 1, dtype=torch.long)
+        offsets[1:] = torch.tensor(lengths, dtype=torch.long).cumsum(0)
+        feature_tensors = {k: torch.cat([torch.as_tensor(rec['feature_arrays'][k]) for rec in data])
+                           for k in data[0]['feature_arrays'].keys()}
+        targets = [rec.get('target', None) for rec in data]
+        if kwargs.get('with_target', True):
+            kwargs.setdefault('targets', targets)
+        return cls(feature_tensors, offsets, **kwargs)
+
+    def __len__(self):
+        return len(self._bounds) - 1
+
+    def __getitem__(self, idx):
+        n = len(self)
+        if idx < 0:
+            idx += n
+        if not 0 <= idx < n:
+            raise IndexError(f'SoATrxDataset index out of range: {idx}')
+        start, end = self._bounds[idx], self._bounds[idx + 1]
+        x = {k: v[start:end] for k, v in self.feature_tensors.items()}
+
+        if self.with_target:
+            return x, self.y_dtype(self.targets[idx])
+        else:
+            return x
+
+
 class ConvertingTrxDataset(Dataset):
     def __init__(self, delegate, style='map', with_target=True):
         self.delegate = delegate
@@ -351,6 +412,16 @@ def padded_collate(batch):
     return PaddedBatch(new_x, lengths), new_y
 
 
+def padded_collate_dropout_trx(batch, trx_dropout, max_seq_len):
+    """`padded_collate` with `DropoutTrx` and tail `max_seq_len` limit applied to the whole batch.
+    Gives a batch of the same form as `DropoutTrxDataset` followed by `padded_collate`:
+    the same kept lengths and their dtype, padding up to the longest kept sequence
+    and the same distribution of kept trx. Sampling is vectorized instead of per-sample numpy calls.
+    """
+    x, y = padded_collate(batch)
+    return batch_dropout_trx(x, trx_dropout, max_seq_len, trim=True), y
+
+
 def padded_collate_distribution_target(batch):
     padded_batch, new_y = padded_collate(batch)
 
@@ -431,6 +502,48 @@ def create_weighted_random_sampler(targets):
     return WeightedRandomSampler(weights, n_take)
 
 
+def suggest_num_workers(max_workers=8):
+    """Number of dataloader workers for current machine
+
+    Available cpu are shared between processes of distributed training on the same node.
+    The result is limited by `max_workers`, more workers rarely speed up the loading.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        cpu_count = len(os.sched_getaffinity(0))
+    else:
+        cpu_count = os.cpu_count() or 1
+    local_world_size = int(os.environ.get('LOCAL_WORLD_SIZE', 1))
+    return min(max_workers, max(1, cpu_count // local_world_size))
+
+
+def worker_loader_params(params):
+    """DataLoader worker and memory options from loader config
+
+    num_workers:
+        number of loader processes, 'auto' for `suggest_num_workers()`
+    pin_memory:
+        copy batches to page-locked memory with `PaddedBatch.pin_memory`,
+        so `.to(device, non_blocking=True)` is asynchronous.
+        Default: True when cuda is available
+    persistent_workers:
+        keep worker processes between epochs. Default: True when `num_workers > 0`
+    prefetch_factor:
+        number of batches loaded in advance by each worker. Default: 2.
+        Kept small because each prefetched batch holds pinned memory
+    """
+    num_workers = params.num_workers
+    if num_workers == 'auto':
+        num_workers = suggest_num_workers()
+    loader_params = dict(
+        num_workers=num_workers,
+        pin_memory=params.get('pin_memory', torch.cuda.is_available()),
+    )
+    if num_workers > 0:
+        loader_params['persistent_workers'] = params.get('persistent_workers', True)
+        loader_params['prefetch_factor'] = params.get('prefetch_factor', 2)
+    return loader_params
+
+
 def create_train_loader(dataset, params):
     if params.get('random_neg', False):
         targets = [y for x, y in dataset]
@@ -438,15 +551,20 @@ def create_train_loader(dataset, params):
     else:
         sampler = None
 
-    dataset = DropoutTrxDataset(dataset, params.trx_dropout, params.max_seq_len)
+    if params.get('batch_trx_dropout', False):
+        collate_fn = partial(padded_collate_dropout_trx,
+                             trx_dropout=params.trx_dropout, max_seq_len=params.max_seq_len)
+    else:
+        dataset = DropoutTrxDataset(dataset, params.trx_dropout, params.max_seq_len)
+        collate_fn = padded_collate
 
     valid_loader = DataLoader(
         dataset,
         batch_size=params.batch_size,
         shuffle=sampler is None,
         sampler=sampler,
-        num_workers=params.num_workers,
-        collate_fn=padded_collate)
+        collate_fn=collate_fn,
+        **worker_loader_params(params))
 
     return valid_loader
 
@@ -492,8 +610,8 @@ def create_validation_loader(dataset, params):
         dataset,
         batch_size=params.batch_size,
         shuffle=False,
-        num_workers=params.num_workers,
-        collate_fn=padded_collate)
+        collate_fn=padded_collate,
+        **worker_loader_params(params))
 
     return valid_loader
 
@@ -1,5 +1,7 @@
 import numpy as np
+import torch
 from ptls.data_load.feature_dict import FeatureDict
+from ptls.data_load.padded_batch import PaddedBatch
 
 
 class DropoutTrx(FeatureDict):
@@ -7,8 +9,13 @@ class DropoutTrx(FeatureDict):
     This class is used as 'f_augmentation' argument for 
     ptls.data_load.datasets.augmentation_dataset.AugmentationDataset (AugmentationIterableDataset).
     """
+    # shorter sequences are sampled with one `argpartition` and `np.sort`
+    mask_min_seq_len = 1000
+
     def __init__(self, trx_dropout):
         self.trx_dropout = trx_dropout
+        self._rng = None
+        self._rng_seed = None
 
     def __call__(self, x):
         seq_len = FeatureDict.get_seq_len(x)
@@ -17,9 +24,109 @@ class DropoutTrx(FeatureDict):
         new_x = self.seq_indexing(x, idx)
         return new_x
 
+    def get_worker_rng(self):
+        """Generator of the current dataloader worker, `None` in the main process.
+
+        Each dataloader worker uses its own generator, created lazily and seeded from torch worker seed.
+        The main process uses the global numpy state, so `np.random.seed` or `pl.seed_everything`
+        make dropout reproducible even for an already used instance.
+        """
+        worker_info = torch.utils.data.get_worker_info()
+        if worker_info is None:
+            return None
+        if self._rng is None or self._rng_seed != worker_info.seed:
+            self._rng = np.random.default_rng(worker_info.seed)
+            self._rng_seed = worker_info.seed
+        return self._rng
+
+    @staticmethod
+    def sample_without_replacement(n, size, rng=None):
+        """`size` unique random integers from `[0, n)` in arbitrary order.
+
+        Without `rng` `size` smallest of `n` random keys from the global numpy state are taken,
+        this is O(n) without a full permutation which legacy `np.random.choice(replace=False)` makes.
+        """
+        if rng is not None:
+            return rng.choice(n, size=size, replace=False, shuffle=False)
+        if size == 0:
+            return np.empty(0, dtype=np.intp)
+        return np.random.random(n).argpartition(size - 1)[:size]
+
     def get_idx(self, seq_len):
         if self.trx_dropout > 0 and seq_len > 0:
-            idx = np.random.choice(seq_len, size=int(seq_len * (1 - self.trx_dropout)+1), replace=False)
-            return np.sort(idx)
+            n_keep = int(seq_len * (1 - self.trx_dropout)+1)
+            rng = self.get_worker_rng()
+            if seq_len < self.mask_min_seq_len:
+                # `n_keep` smallest random keys, sorting a short index is cheaper than the mask
+                keys = np.random.random(seq_len) if rng is None else rng.random(seq_len)
+                return np.sort(keys.argpartition(n_keep - 1)[:n_keep])
+
+            # sample the smaller of kept and dropped sets,
+            # the mask gives sorted indexes without `np.sort`
+            keep_sampled = n_keep <= seq_len - n_keep
+            mask = np.full(seq_len, not keep_sampled)
+            ix = self.sample_without_replacement(seq_len, n_keep if keep_sampled else seq_len - n_keep, rng)
+            mask[ix] = keep_sampled
+            return np.flatnonzero(mask)
         else:
             return np.arange(seq_len)
+
+
+def batch_dropout_trx(x: PaddedBatch, trx_dropout, max_seq_len=None, trim=False):
+    """`DropoutTrx` for the whole padded batch
+
+    For each sequence with length L `int(L * (1 - trx_dropout) + 1)` random transactions are kept.
+    Kept transactions are moved to the sequence start in original order, tail is padded with zeros.
+    When `max_seq_len` is set, only `max_seq_len` last kept transactions are taken.
+
+    Parameters
+        x:
+            PaddedBatch with feature dict or tensor payload
+        trx_dropout:
+            Probability of transaction drop
+        max_seq_len:
+            Limit for sequence length after dropout
+        trim:
+            Cut padding to the longest kept sequence like `padded_collate` does.
+            Requires a host sync, use it on cpu
+    """
+    valid_mask = x.seq_len_mask.bool()
+    B, T = valid_mask.size()
+    device = valid_mask.device
+    seq_lens = torch.as_tensor(x.seq_lens, device=device)
+
+    if trx_dropout > 0:
+        # float64 like python float in `DropoutTrx.get_idx`, float32 rounds some lengths up
+        new_lens = torch.minimum((seq_lens.double() * (1 - trx_dropout) + 1).long(), seq_lens.long())
+        # random rank of each valid position, padding positions are ranked last
+        scores = torch.rand(B, T, device=device).masked_fill_(~valid_mask, 2.0)
+        order = scores.argsort(dim=1)
+        keep_mask = torch.empty_like(valid_mask).scatter_(
+            1, order, torch.arange(T, device=device).unsqueeze(0) < new_lens.unsqueeze(1))
+    else:
+        new_lens = seq_lens.long()
+        keep_mask = valid_mask
+
+    # stable sort moves kept positions to the start with original order
+    ix = torch.sort((~keep_mask).int(), dim=1, stable=True).indices
+    if max_seq_len is not None and max_seq_len < T:
+        shift = (new_lens - max_seq_len).clamp(min=0)
+        ix = ix.gather(1, shift.unsqueeze(1) + torch.arange(max_seq_len, device=device).unsqueeze(0))
+        new_lens = new_lens.clamp(max=max_seq_len)
+        T = max_seq_len
+    if trim:
+        T = min(T, int(new_lens.max()) if B > 0 else 0)
+        ix = ix[:, :T]
+    new_mask = torch.arange(T, device=device).unsqueeze(0) < new_lens.unsqueeze(1)
+
+    def _gather(v):
+        v_shape = (B, T, *[1] * (v.dim() - 2))
+        new_v = v.gather(1, ix.view(v_shape).expand(B, T, *v.size()[2:]))
+        # masked_fill, not multiplication: dropped nan or inf must not leak into padding
+        return new_v.masked_fill(~new_mask.view(v_shape), 0)
+
+    if type(x.payload) is dict:
+        payload = {k: _gather(v) if x.is_seq_feature(k, v) else v for k, v in x.payload.items()}
+    else:
+        payload = _gather(x.payload)
+    return PaddedBatch(payload, new_lens.to(seq_lens.dtype))
@@ -59,7 +59,14 @@ class FeatureDict:
         -------
 
         """
-        return {k: v[ix] if FeatureDict.is_seq_feature(k, v) else v for k, v in d.items()}
+        # numpy indexes are converted once instead of per each torch feature.
+        # torch accepts only int64, int32 and bool index tensors, other arrays are used as is.
+        # Read-only arrays are copied, torch warns about non-writable memory on `from_numpy`
+        t_ix = ix
+        if type(ix) is np.ndarray and ix.dtype in (np.int64, np.int32, np.bool_):
+            t_ix = torch.from_numpy(ix) if ix.flags.writeable else torch.tensor(ix)
+        return {k: (v[t_ix] if type(v) is torch.Tensor else v[ix]) if FeatureDict.is_seq_feature(k, v) else v
+                for k, v in d.items()}
 
     @staticmethod
     def get_seq_len(d):
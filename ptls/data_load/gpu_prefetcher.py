@@ -0,0 +1,94 @@
+import torch
+
+from ptls.data_load.padded_batch import PaddedBatch
+
+
+class GPUPrefetcher:
+    """
+    Wraps a dataloader and moves batches to `device` one step ahead.
+    The copy of the next batch runs on a separate cuda stream while the current batch is processed,
+    so host to device transfer overlaps with compute. Copy from pageable memory can't be asynchronous,
+    so batches which are not pinned yet are pinned before the copy.
+    Use `pin_memory=True` dataloader to pin batches in its background thread instead.
+    Data loading itself stays in dataloader workers.
+    For non-cuda device batches are moved synchronously.
+
+    This is an opt-in utility for hand-written training or inference loops, nothing in ptls uses it.
+    `pl.Trainer` moves batches to the device itself, pass it a `pin_memory=True` dataloader instead.
+    """
+    def __init__(self, loader, device):
+        """
+        Initialize a GPUPrefetcher.
+
+        :param loader: iterable with batches. Batch can be a tensor, PaddedBatch
+            or tuple, list, dict of them.
+        :param device: target device.
+        """
+        self.loader = loader
+        self.device = torch.device(device)
+
+    def __iter__(self):
+        if self.device.type != 'cuda':
+            for batch in self.loader:
+                yield self._to_device(batch)
+            return
+
+        copy_stream = torch.cuda.Stream(self.device)
+        it = iter(self.loader)
+        next_batch = self._preload(it, copy_stream)
+        while next_batch is not None:
+            current_stream = torch.cuda.current_stream(self.device)
+            current_stream.wait_stream(copy_stream)
+            batch = next_batch
+            self._record_stream(batch, current_stream)
+            next_batch = self._preload(it, copy_stream)
+            yield batch
+
+    def __len__(self):
+        return len(self.loader)
+
+    def _preload(self, it, copy_stream):
+        try:
+            batch = next(it)
+        except StopIteration:
+            return None
+        batch = self._pin_memory(batch)
+        with torch.cuda.stream(copy_stream):
+            return self._to_device(batch)
+
+    def _to_device(self, batch):
+        if isinstance(batch, (torch.Tensor, PaddedBatch)):
+            return batch.to(self.device, non_blocking=True)
+        if isinstance(batch, (tuple, list)):
+            return type(batch)(self._to_device(v) for v in batch)
+        if isinstance(batch, dict):
+            return {k: self._to_device(v) for k, v in batch.items()}
+        return batch
+
+    @classmethod
+    def _pin_memory(cls, batch):
+        if isinstance(batch, torch.Tensor):
+            return batch if batch.is_pinned() else batch.pin_memory()
+        if isinstance(batch, PaddedBatch):
+            return batch if batch.seq_lens.is_pinned() else batch.pin_memory()
+        if isinstance(batch, (tuple, list)):
+            return type(batch)(cls._pin_memory(v) for v in batch)
+        if isinstance(batch, dict):
+            return {k: cls._pin_memory(v) for k, v in batch.items()}
+        return batch
+
+    @classmethod
+    def _record_stream(cls, batch, stream):
+        """Memory allocated on copy stream shouldn't be reused until the compute stream is done with it
+        """
+        if isinstance(batch, torch.Tensor):
+            batch.record_stream(stream)
+        elif isinstance(batch, PaddedBatch):
+            cls._record_stream(batch.payload, stream)
+            cls._record_stream(batch.seq_lens, stream)
+        elif isinstance(batch, (tuple, list)):
+            for v in batch:
+                cls._record_stream(v, stream)
+        elif isinstance(batch, dict):
+            for v in batch.values():
+                cls._record_stream(v, stream)
@@ -103,6 +103,20 @@ class PaddedBatch:
         }
         return PaddedBatch(payload, length)
 
+    def pin_memory(self):
+        """Copy of the batch in page-locked memory.
+        Called by `DataLoader(pin_memory=True)`, makes `.to(device, non_blocking=True)` asynchronous.
+        """
+        length = self._length.pin_memory()
+        if type(self._payload) is dict:
+            payload = {
+                k: v.pin_memory() if type(v) is torch.Tensor else v
+                for k, v in self._payload.items()
+            }
+        else:
+            payload = self._payload.pin_memory()
+        return PaddedBatch(payload, length)
+
     @property
     def seq_len_mask(self):
         """mask with B*T size for valid tokens in `payload`
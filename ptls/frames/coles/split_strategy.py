@@ -26,13 +26,12 @@ class SampleRandom(AbsSplit):
 
     def split(self, dates):
         date_len = dates.shape[0]
-        date_range = np.arange(date_len)
 
         lengths = np.random.randint(self.cnt_min, self.cnt_max, self.split_count)
         splits = []
         for i, l in enumerate(lengths):
             rand_perm = np.random.permutation(date_len)
-            splits.append(np.sort(date_range[rand_perm][:l]))
+            splits.append(np.sort(rand_perm[:l]))
         return splits
 
 
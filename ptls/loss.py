@@ -37,12 +37,17 @@ def r_squared(pred, actual):
 class PairwiseMarginRankingLoss(nn.Module):
     def __init__(self, margin=0.0, size_average=None, reduce=None, reduction='mean'):
         """
-        Pairwise Margin Ranking Loss. All setted parameters redirected to nn.MarginRankingLoss.
+        Pairwise Margin Ranking Loss. All setted parameters have the same meaning as in nn.MarginRankingLoss.
         All the difference is that pairs automatically generated for margin ranking loss.
         All possible pairs of different class are generated.
         """
         super().__init__()
-        self.margin_loss = nn.MarginRankingLoss(margin, size_average, reduce, reduction)
+        # legacy `size_average` and `reduce` are resolved the same way as in nn.MarginRankingLoss
+        reduction = nn.MarginRankingLoss(margin, size_average, reduce, reduction).reduction
+        if reduction not in ('none', 'mean', 'sum'):
+            raise ValueError(f'{reduction} is not a valid value for reduction')
+        self.margin = margin
+        self.reduction = reduction
 
     def forward(self, prediction, label):
         """
@@ -62,12 +67,14 @@ class PairwiseMarginRankingLoss(nn.Module):
         pred_0_n = pred_0.size()[0]
 
         if pred_1_n > 0 and pred_0_n:
-            # create pairs
-            pred_00 = pred_0.unsqueeze(0).repeat(1, pred_1_n)
-            pred_11 = pred_1.unsqueeze(1).repeat(1, pred_0_n).view(pred_00.size())
-            out01 = -1 * torch.ones(pred_1_n*pred_0_n).to(prediction.device)
-
-            return self.margin_loss(pred_00.view(-1), pred_11.view(-1), out01)
+            # all positive-negative pairs by broadcasting, shape (pred_1_n, pred_0_n)
+            loss = F.relu(self.margin - pred_1.unsqueeze(1) + pred_0.unsqueeze(0))
+
+            if self.reduction == 'mean':
+                return loss.mean()
+            if self.reduction == 'sum':
+                return loss.sum()
+            return loss.view(-1)
         else:
             return torch.sum(prediction) * 0.0
 
@@ -18,4 +18,4 @@ from .normalization import L2NormEncoder
 
 from .binarization import BinarizationLayer
 
-from .seq_step import FirstStepEncoder, LastStepEncoder, TimeStepShuffle, SkipStepEncoder
+from .seq_step import FirstStepEncoder, LastStepEncoder, TimeStepShuffle, SkipStepEncoder, BatchedDropoutTrx
@@ -2,6 +2,7 @@ import torch
 import numpy as np
 from torch import nn as nn
 
+from ptls.data_load.augmentations.dropout_trx import batch_dropout_trx
 from ptls.data_load.padded_batch import PaddedBatch
 
 
@@ -18,6 +19,29 @@ class TimeStepShuffle(nn.Module):
         return shuffled
 
 
+class BatchedDropoutTrx(nn.Module):
+    """Batch level version of `ptls.data_load.augmentations.DropoutTrx`.
+    Works on the device where the batch is placed, so it can be used instead of per-sample
+    augmentation in dataloader workers. Active in train mode only.
+
+    For each sequence with length L `int(L * (1 - trx_dropout) + 1)` random transactions are kept.
+    Kept transactions are moved to the sequence start in original order, tail is padded with zeros.
+    Sequence length T of `payload` isn't changed.
+
+    Parameters
+        trx_dropout:
+            Probability of transaction drop
+    """
+    def __init__(self, trx_dropout):
+        super().__init__()
+        self.trx_dropout = trx_dropout
+
+    def forward(self, x: PaddedBatch):
+        if not self.training or self.trx_dropout <= 0:
+            return x
+        return batch_dropout_trx(x, self.trx_dropout)
+
+
 class LastStepEncoder(nn.Module):
     """
     Class is used by ptls.nn.RnnSeqEncoder for reducing RNN output with shape (B, L, H), where
@@ -55,7 +55,7 @@ class LogNumToVector(IdentityScaler):
 
     def forward(self, x):
         x = super().forward(x)
-        return x.abs().log1p() * x.sign() * self.w + self.b
+        return torch.addcmul(self.b, x.abs().log1p_().copysign_(x), self.w)
 
     @property
     def output_size(self):
@@ -1,7 +1,13 @@
+import numpy as np
+import pytest
 import torch
+from pyhocon import ConfigFactory
 from torch.utils.data import DataLoader
 
 from ptls.data_load import padded_collate, ZeroDownSampler, DropoutTrxDataset, TrxDataset, LastKTrxDataset
+from ptls.data_load import SoATrxDataset
+from ptls.data_load import worker_loader_params, suggest_num_workers, padded_collate_dropout_trx
+from ptls.data_load import create_train_loader
 from ptls.data_load import augmentation_chain
 from ptls_tests.utils.data_generation import gen_trx_data
 
@@ -24,6 +30,42 @@ def test_padded_collate():
     assert x.payload['a'].eq(tt).all()
 
 
+def test_padded_collate_dropout_trx():
+    data = [
+        ({'a': torch.arange(1, 11)}, torch.tensor(0)),
+        ({'a': torch.arange(1, 4)}, torch.tensor(0)),
+        ({'a': torch.arange(1, 41)}, torch.tensor(1)),
+    ]
+
+    x, y = padded_collate_dropout_trx(data, trx_dropout=0.1, max_seq_len=5)
+
+    assert x.payload['a'].shape == (3, 5)
+    torch.testing.assert_close(x.seq_lens, torch.IntTensor([5, 3, 5]))
+    torch.testing.assert_close(x.payload['a'][1], torch.tensor([1, 2, 3, 0, 0]))
+    assert (x.payload['a'][[0, 2]].diff(dim=1) > 0).all()
+    torch.testing.assert_close(y, torch.tensor([0, 0, 1]))
+
+
+def test_padded_collate_dropout_trx_same_as_dataset():
+    ds = TrxDataset(gen_trx_data(range(0, 120)))
+    data = list(ds)
+    for p, max_seq_len in [(0.1, 1000), (0.33, 1000), (0.9, 1000), (0.3, 20)]:
+        x, _ = padded_collate_dropout_trx(data, trx_dropout=p, max_seq_len=max_seq_len)
+        x_ref, _ = padded_collate(list(DropoutTrxDataset(ds, trx_dropout=p, seq_len=max_seq_len)))
+        torch.testing.assert_close(x.seq_lens, x_ref.seq_lens)
+        for k, v in x.payload.items():
+            assert v.shape == x_ref.payload[k].shape
+
+
+def test_padded_collate_dropout_trx_zero_padding():
+    data = [({'a': torch.tensor([1., float('nan'), 3., 4.])}, torch.tensor(0))] * 20 + \
+           [({'a': torch.arange(1., 9.)}, torch.tensor(0))]
+    x, _ = padded_collate_dropout_trx(data, trx_dropout=0.5, max_seq_len=10)
+    torch.testing.assert_close(x.seq_lens, torch.IntTensor([3] * 20 + [5]))
+    assert x.payload['a'].shape == (21, 5)
+    assert (x.payload['a'][:20, 3:] == 0).all()
+
+
 def test_zero_down_sampler():
     y = torch.LongTensor([1, 0, 1, 0, 0, 0])
     sampler = ZeroDownSampler(y)
@@ -41,6 +83,60 @@ def test_data_loader():
     assert all(y0 == y)
 
 
+def test_train_loader_batch_trx_dropout():
+    data = gen_trx_data((torch.rand(100)*60+1).long())
+    params = ConfigFactory.from_dict({
+        'trx_dropout': 0.1, 'batch_trx_dropout': True, 'max_seq_len': 15, 'batch_size': 10, 'num_workers': 0,
+    })
+    dl = create_train_loader(TrxDataset(data), params)
+    for x, y in dl:
+        assert x.payload['mcc_code'].size() == (10, 15)
+        assert (x.seq_lens <= 15).all()
+
+
+def test_worker_loader_params():
+    params = worker_loader_params(ConfigFactory.from_dict({'num_workers': 0}))
+    assert params == {'num_workers': 0, 'pin_memory': torch.cuda.is_available()}
+
+    params = worker_loader_params(ConfigFactory.from_dict({'num_workers': 2, 'pin_memory': False}))
+    assert params == {'num_workers': 2, 'pin_memory': False, 'persistent_workers': True, 'prefetch_factor': 2}
+
+
+def test_worker_loader_params_auto():
+    params = worker_loader_params(ConfigFactory.from_dict({'num_workers': 'auto'}))
+    assert params['num_workers'] == suggest_num_workers()
+    assert 1 <= suggest_num_workers() <= 8
+
+
+def test_soa_trx_dataset():
+    data = gen_trx_data([4, 3, 2])
+    ds = SoATrxDataset.from_records(data)
+    ref = TrxDataset(data)
+    assert len(ds) == 3
+    for (x, y), (x_ref, y_ref) in zip(ds, ref):
+        assert y == y_ref
+        for k, v in x_ref.items():
+            torch.testing.assert_close(x[k], v)
+            assert x[k]._base is ds.feature_tensors[k]  # view, not a copy
+    x, _ = padded_collate([ds[i] for i in range(3)])
+    assert x.seq_lens.tolist() == [4, 3, 2]
+
+    x, _ = ds[-1]
+    torch.testing.assert_close(x['amount'], ref[-1][0]['amount'])
+    with pytest.raises(IndexError):
+        ds[-4]
+    with pytest.raises(IndexError):
+        ds[3]
+
+
+def test_soa_trx_dataset_numpy_records():
+    data = [{'feature_arrays': {'mcc': np.arange(l)}, 'target': 1} for l in [3, 1]]
+    ds = SoATrxDataset.from_records(data)
+    x, y = ds[0]
+    torch.testing.assert_close(x['mcc'], torch.arange(3))
+    assert y == 1
+
+
 def test_last_k_trx_dataset():
     data = gen_trx_data([100, 100, 100])
     res = [len(next(iter(x.values()))) for x, _ in LastKTrxDataset(TrxDataset(data), .5)]
@@ -1,6 +1,8 @@
 import numpy as np
+import torch
 
 from ptls.data_load.augmentations.dropout_trx import DropoutTrx
+from ptls.data_load.datasets import AugmentationDataset
 
 
 def test_no_dropout():
@@ -24,3 +26,51 @@ def test_with_target():
     data = i_filter(data)
     assert len(data['mcc']) == 91
     assert (np.diff(data['mcc']) >= 0).all()
+
+
+def test_short_and_long_sequences():
+    for p in [0.1, 0.5, 0.9]:
+        for seq_len in [1, 10, DropoutTrx.mask_min_seq_len - 1, DropoutTrx.mask_min_seq_len, 5000]:
+            idx = DropoutTrx(p).get_idx(seq_len)
+            assert len(idx) == int(seq_len * (1 - p) + 1)
+            assert (np.diff(idx) > 0).all()
+            assert 0 <= idx[0] and idx[-1] < seq_len
+
+
+def test_long_sequences_in_workers():
+    i_filter = DropoutTrx(0.1)
+    data = [{'mcc': np.arange(5000)} for _ in range(2)]
+    dl = torch.utils.data.DataLoader(
+        AugmentationDataset(data, [i_filter]), batch_size=None, num_workers=1,
+    )
+    for b in dl:
+        assert len(b['mcc']) == 4501
+        assert (b['mcc'].diff() > 0).all()
+
+
+def test_seed_from_global_numpy():
+    np.random.seed(42)
+    idx_1 = DropoutTrx(0.5).get_idx(100)
+    np.random.seed(42)
+    idx_2 = DropoutTrx(0.5).get_idx(100)
+    np.testing.assert_equal(idx_1, idx_2)
+
+
+def test_seed_from_global_numpy_reused_instance():
+    i_filter = DropoutTrx(0.5)
+    np.random.seed(1)
+    idx_1 = i_filter.get_idx(50)
+    np.random.seed(1)
+    idx_2 = i_filter.get_idx(50)
+    np.testing.assert_equal(idx_1, idx_2)
+
+
+def test_workers_have_different_rng():
+    i_filter = DropoutTrx(0.5)
+    data = [{'mcc': np.arange(100)} for _ in range(4)]
+    dl = torch.utils.data.DataLoader(
+        AugmentationDataset(data, [i_filter]), batch_size=None, num_workers=2,
+    )
+    batches = [b['mcc'] for b in dl]
+    # items 0 and 1 are produced by different workers
+    assert not torch.equal(batches[0], batches[1])
@@ -1,3 +1,4 @@
+import warnings
 from collections import OrderedDict
 
 import numpy as np
@@ -107,3 +108,30 @@ def test_seq_len_nolen():
             ('bin', 2),
         ])
         FeatureDict.get_seq_len(x)
+
+
+def test_seq_indexing_array_index():
+    x = {
+        't_mcc': torch.IntTensor([5, 6, 7, 8, 9]),
+        'n_mcc': np.array([5, 6, 7, 8, 9]),
+    }
+    y = FeatureDict.seq_indexing(x, np.array([1, 3]))
+    torch.testing.assert_close(y['t_mcc'], torch.IntTensor([6, 8]))
+    np.testing.assert_equal(y['n_mcc'], np.array([6, 8]))
+
+    y = FeatureDict.seq_indexing(x, np.array([False, True, False, True, False]))
+    torch.testing.assert_close(y['t_mcc'], torch.IntTensor([6, 8]))
+    np.testing.assert_equal(y['n_mcc'], np.array([6, 8]))
+
+    for dtype in [np.uint16, np.uint32, np.uint64, np.int8, np.int16, np.int32]:
+        y = FeatureDict.seq_indexing(x, np.array([1, 3], dtype=dtype))
+        torch.testing.assert_close(y['t_mcc'], torch.IntTensor([6, 8]))
+        np.testing.assert_equal(y['n_mcc'], np.array([6, 8]))
+
+    ix = np.array([1, 3])
+    ix.flags.writeable = False
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        y = FeatureDict.seq_indexing(x, ix)
+    torch.testing.assert_close(y['t_mcc'], torch.IntTensor([6, 8]))
+    np.testing.assert_equal(y['n_mcc'], np.array([6, 8]))
@@ -0,0 +1,45 @@
+import pytest
+import torch
+
+from ptls.data_load import padded_collate, GPUPrefetcher
+
+
+def test_gpu_prefetcher_cpu():
+    data = [
+        ({'a': torch.tensor([1, 2, 3, 4])}, torch.tensor(0)),
+        ({'a': torch.tensor([1, 2])}, torch.tensor(0)),
+        ({'a': torch.tensor([1])}, torch.tensor(1)),
+    ]
+    dl = torch.utils.data.DataLoader(data, batch_size=2, collate_fn=padded_collate)
+    prefetcher = GPUPrefetcher(dl, device='cpu')
+
+    assert len(prefetcher) == 2
+    batches = list(prefetcher)
+    assert len(batches) == 2
+    x, y = batches[0]
+    assert x.payload['a'].shape == (2, 4)
+    torch.testing.assert_close(y, torch.tensor([0, 0]))
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason='pinned memory requires cuda')
+def test_gpu_prefetcher_pin_memory():
+    x, y = padded_collate([({'a': torch.tensor([1, 2])}, 0)])
+    pinned_x, pinned_y = GPUPrefetcher._pin_memory((x, y))
+    assert pinned_x.payload['a'].is_pinned()
+    assert pinned_x.seq_lens.is_pinned()
+    assert pinned_y.is_pinned()
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason='cuda required')
+def test_gpu_prefetcher_cuda():
+    data = [
+        ({'a': torch.tensor([1., 2., 3.])}, torch.tensor(0)),
+        ({'a': torch.tensor([1., 2.])}, torch.tensor(1)),
+        ({'a': torch.tensor([1.])}, torch.tensor(1)),
+    ]
+    dl = torch.utils.data.DataLoader(data, batch_size=2, collate_fn=padded_collate)
+    batches = list(GPUPrefetcher(dl, device='cuda'))
+    assert len(batches) == 2
+    x, y = batches[0]
+    assert x.payload['a'].is_cuda and x.seq_lens.is_cuda and y.is_cuda
+    torch.testing.assert_close(x.payload['a'].cpu(), torch.tensor([[1., 2., 3.], [1., 2., 0.]]))
@@ -2,6 +2,7 @@ import numpy as np
 import pytest
 import torch
 
+from ptls.data_load import padded_collate
 from ptls.data_load.padded_batch import PaddedBatch
 
 
@@ -88,6 +89,28 @@ def test_padded_batch_to():
     assert len(y) == 2
 
 
+@pytest.mark.skipif(not torch.cuda.is_available(), reason='pinned memory requires cuda')
+def test_padded_batch_pin_memory():
+    x = get_pb()
+    y = x.pin_memory()
+    assert y.seq_lens.is_pinned()
+    for k, v in y.payload.items():
+        assert v.is_pinned()
+    torch.testing.assert_close(y.payload['bin'], x.payload['bin'])
+
+
+@pytest.mark.skipif(not torch.cuda.is_available(), reason='pinned memory requires cuda')
+def test_padded_batch_pinned_by_data_loader():
+    data = [
+        ({'a': torch.tensor([1., 2., 3.])}, 0),
+        ({'a': torch.tensor([1.])}, 1),
+    ]
+    dl = torch.utils.data.DataLoader(data, batch_size=2, collate_fn=padded_collate, pin_memory=True)
+    x, y = next(iter(dl))
+    assert x.payload['a'].is_pinned()
+    assert x.seq_lens.is_pinned()
+
+
 def test_padded_batch_mask_tensor_trx_embedding():
     data = PaddedBatch(torch.randn(4, 5, 3), torch.tensor([2, 5, 1, 3]))
     out = data.seq_len_mask
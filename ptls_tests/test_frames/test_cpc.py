@@ -2,7 +2,7 @@ import pytorch_lightning as pl
 import torch
 from pyhocon import ConfigFactory
 
-from ptls.data_load import TrxDataset
+from ptls.data_load import SoATrxDataset
 from ptls.data_load import create_train_loader, create_validation_loader
 from ptls.frames.cpc import CpcModule
 from ptls_tests.utils.data_generation import gen_trx_data
@@ -33,14 +33,16 @@ def tst_params():
             "weight_decay": 0,
             "lr": 0.004,
             "batch_size": 32,
-            "num_workers": 1,
+            "num_workers": 'auto',
             "trx_dropout": .1,
             "n_epoch": 1,
             "max_seq_len": 30,
+            # bf16 autocast, spelling changed in lightning 2.0
+            "precision": 'bf16' if pl.__version__.startswith('1.') else 'bf16-mixed',
         },
         "valid": {
             "batch_size": 32,
-            "num_workers": 1,
+            "num_workers": 'auto',
             "max_seq_len": 30,
             "recall_top_k": 3
         },
@@ -63,9 +65,9 @@ def test_rnn_model():
         lr_scheduler_partial=partial(torch.optim.lr_scheduler.StepLR, step_size=1, gamma=1.0),
     )
     train_data = gen_trx_data((torch.rand(1000)*60+1).long())
-    train_ds = TrxDataset(train_data)
+    train_ds = SoATrxDataset.from_records(train_data)
     test_data = gen_trx_data((torch.rand(100)*60+1).long())
-    valid_ds = TrxDataset(test_data)
+    valid_ds = SoATrxDataset.from_records(test_data)
 
     train_loader = create_train_loader(train_ds, config['train'])
     valid_loader = create_validation_loader(valid_ds, config['valid'])
@@ -73,6 +75,7 @@ def test_rnn_model():
     trainer = pl.Trainer(
         accelerator="cpu",
         max_steps=50,
+        precision=config['train.precision'],
         enable_checkpointing=False,
     )
     trainer.fit(pl_module, train_loader, valid_loader)
@@ -1,8 +1,9 @@
 import torch
 
 from ptls.nn import TimeStepShuffle
+from ptls.data_load.augmentations.dropout_trx import DropoutTrx
 from ptls.data_load.padded_batch import PaddedBatch
-from ptls.nn.seq_step import SkipStepEncoder
+from ptls.nn.seq_step import SkipStepEncoder, BatchedDropoutTrx
 
 
 def test_timestep_shuffle():
@@ -21,4 +22,42 @@ def test_skip_step_encoder():
 
     res = SkipStepEncoder(3)(PaddedBatch(t, [10, 9, 8, 7, 3, 2, 1, 0]))
 
-    assert res.payload.shape == (8, 4, 2)
\ No newline at end of file
+    assert res.payload.shape == (8, 4, 2)
+
+
+def test_batched_dropout_trx():
+    x = PaddedBatch({
+        'mcc': torch.arange(1, 31).view(3, 10) * (torch.arange(10) < torch.tensor([[10], [3], [0]])),
+        'target': torch.tensor([1, 0, 1]),
+    }, torch.tensor([10, 3, 0]))
+
+    res = BatchedDropoutTrx(0.1)(x)
+
+    torch.testing.assert_close(res.seq_lens, torch.tensor([10, 3, 0]))
+    res = BatchedDropoutTrx(0.5)(x)
+    torch.testing.assert_close(res.seq_lens, torch.tensor([6, 2, 0]))
+    mcc = res.payload['mcc']
+    assert mcc.shape == (3, 10)
+    assert (mcc[0, :6].diff() > 0).all()
+    assert (mcc[0, 6:] == 0).all()
+    assert (mcc[1, :2].diff() > 0).all()
+    assert (mcc[1, 2:] == 0).all()
+    assert set(mcc[1, :2].tolist()) <= {11, 12, 13}
+    torch.testing.assert_close(res.payload['target'], torch.tensor([1, 0, 1]))
+
+
+def test_batched_dropout_trx_kept_count():
+    seq_lens = torch.arange(0, 301)
+    T = int(seq_lens.max())
+    x = PaddedBatch(torch.arange(1, T + 1).repeat(len(seq_lens), 1) * (torch.arange(T) < seq_lens.unsqueeze(1)),
+                    seq_lens)
+    for p in [0.01, 0.1, 0.3, 0.33, 0.5, 0.9]:
+        res = BatchedDropoutTrx(p)(x)
+        expected = [len(DropoutTrx(p).get_idx(int(l))) for l in seq_lens]
+        assert res.seq_lens.tolist() == expected
+
+
+def test_batched_dropout_trx_eval():
+    x = PaddedBatch(torch.randn(2, 4, 3), torch.tensor([4, 2]))
+    m = BatchedDropoutTrx(0.5).eval()
+    assert m(x) is x
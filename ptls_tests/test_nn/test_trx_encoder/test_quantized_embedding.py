@@ -0,0 +1,42 @@
+import torch
+
+from ptls.data_load.padded_batch import PaddedBatch
+from ptls.nn.trx_encoder import TrxEncoder
+from ptls.nn.trx_encoder.quantized_embedding import Int8Embedding, quantize_embeddings
+
+
+def test_int8_embedding():
+    embedding = torch.nn.Embedding(20, 4, padding_idx=0)
+    q_embedding = Int8Embedding.from_embedding(embedding)
+    assert q_embedding.weight_q.dtype == torch.int8
+    assert q_embedding.scale.size() == (20, 1)
+
+    x = torch.randint(0, 20, (3, 7))
+    out = q_embedding(x)
+    assert out.size() == (3, 7, 4)
+    torch.testing.assert_close(out, embedding(x).detach(), atol=embedding.weight.abs().max().item() / 127, rtol=0)
+    torch.testing.assert_close(q_embedding(torch.tensor([0])), torch.zeros(1, 4))
+
+
+def test_quantize_embeddings():
+    B, T = 5, 20
+    trx_encoder = TrxEncoder(
+        embeddings={'mcc_code': {'in': 100, 'out': 5}},
+        numeric_values={'amount': 'log'},
+        embeddings_noise=0.1,
+    ).eval()
+    x = PaddedBatch(
+        payload={
+            'mcc_code': torch.randint(0, 99, (B, T)),
+            'amount': torch.randn(B, T),
+        },
+        length=torch.randint(10, 20, (B,)),
+    )
+    with torch.no_grad():
+        expected = trx_encoder(x).payload
+        quantize_embeddings(trx_encoder)
+        out = trx_encoder(x).payload
+
+    assert type(trx_encoder.embeddings['mcc_code']) is Int8Embedding
+    assert trx_encoder.output_size == 6
+    torch.testing.assert_close(out, expected, atol=0.02, rtol=0)
@@ -0,0 +1,37 @@
+import torch
+
+from ptls.nn.trx_encoder.scalers import LogScaler, LogNumToVector
+
+
+def get_x():
+    return torch.tensor([[-100., -1.5, -0.2, 0., 0.3, 2., 1000.]], requires_grad=True)
+
+
+def test_log_scaler():
+    x = get_x()
+    out = LogScaler()(x)
+
+    x_ref = get_x()
+    out_ref = x_ref.unsqueeze(2).abs().log1p() * x_ref.unsqueeze(2).sign()
+
+    torch.testing.assert_close(out, out_ref)
+    out.sum().backward()
+    out_ref.sum().backward()
+    torch.testing.assert_close(x.grad, x_ref.grad)
+
+
+def test_log_num_to_vector():
+    m = LogNumToVector(4)
+    x = get_x()
+    out = m(x)
+    grads = torch.autograd.grad(out.pow(2).sum(), [x, m.w, m.b])
+
+    x_ref = get_x()
+    x_ref_3d = x_ref.unsqueeze(2)
+    out_ref = x_ref_3d.abs().log1p() * x_ref_3d.sign() * m.w + m.b
+    grads_ref = torch.autograd.grad(out_ref.pow(2).sum(), [x_ref, m.w, m.b])
+
+    assert out.shape == (1, 7, 4)
+    torch.testing.assert_close(out, out_ref)
+    for g, g_ref in zip(grads, grads_ref):
+        torch.testing.assert_close(g, g_ref)
@@ -1,3 +1,4 @@
+import pytest
 import torch
 
 from ptls.loss import PairwiseMarginRankingLoss
@@ -43,3 +44,42 @@ def test_minimal_example():
 
     assert 0. == out
     assert type(out) is torch.Tensor
+
+
+def _margin_ranking_inputs():
+    prediction = torch.tensor([0.2, 0.5, 0.6, 0.7, 0.3])
+    label = torch.tensor([1, 0, 1, 0, 0])
+    # all (positive, negative) pairs, positive-major order
+    pred_0 = torch.tensor([0.5, 0.7, 0.3, 0.5, 0.7, 0.3])
+    pred_1 = torch.tensor([0.2, 0.2, 0.2, 0.6, 0.6, 0.6])
+    return prediction, label, pred_0, pred_1
+
+
+@pytest.mark.parametrize('reduction', ['mean', 'sum', 'none'])
+def test_same_as_margin_ranking_loss_reduction(reduction):
+    prediction, label, pred_0, pred_1 = _margin_ranking_inputs()
+    expected = torch.nn.MarginRankingLoss(0.1, reduction=reduction)(pred_0, pred_1, -torch.ones(6))
+
+    out = PairwiseMarginRankingLoss(0.1, reduction=reduction)(prediction, label)
+
+    torch.testing.assert_close(out, expected)
+
+
+@pytest.mark.parametrize('size_average, reduce, reduction', [
+    (None, None, 'mean'),
+    (False, None, 'sum'),
+    (None, False, 'none'),
+    (True, True, 'mean'),
+])
+def test_legacy_reduction_args(size_average, reduce, reduction):
+    prediction, label, pred_0, pred_1 = _margin_ranking_inputs()
+    expected = torch.nn.MarginRankingLoss(0.1, reduction=reduction)(pred_0, pred_1, -torch.ones(6))
+
+    loss = PairwiseMarginRankingLoss(0.1, size_average=size_average, reduce=reduce)
+    assert loss.reduction == reduction
+    torch.testing.assert_close(loss(prediction, label), expected)
+
+
+def test_invalid_reduction():
+    with pytest.raises(ValueError):
+        PairwiseMarginRankingLoss(reduction='meen')
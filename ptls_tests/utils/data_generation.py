@@ -14,12 +14,19 @@ def gen_trx_data(lengths, target_share=.5, target_type='bin_cls', use_feature_ar
     else:
         raise AttributeError(f'Unknown target_type: {target_type}')
 
+    # features for all samples are generated at once, samples are views of these tensors
+    lengths = [int(length) for length in lengths]
+    total_len = sum(lengths)
+    trans_type = (torch.rand(total_len) * 10 + 1).long().split(lengths)
+    mcc_code = (torch.rand(total_len) * 20 + 1).long().split(lengths)
+    amount = (torch.rand(total_len) * 1000 + 1).long().split(lengths)
+
     samples = list()
-    for target, length in zip(targets, lengths):
+    for i, target in enumerate(targets):
         s = dict()
-        s['trans_type'] = (torch.rand(length)*10 + 1).long()
-        s['mcc_code'] = (torch.rand(length) * 20 + 1).long()
-        s['amount'] = (torch.rand(length) * 1000 + 1).long()
+        s['trans_type'] = trans_type[i]
+        s['mcc_code'] = mcc_code[i]
+        s['amount'] = amount[i]
 
         if use_feature_arrays_key:
             samples.append({'feature_arrays': s, 'target': target})